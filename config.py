@@ -11,15 +11,24 @@
 import os
 from pathlib import Path
 
+__all__ = [
+    'ROOT_DIR', 'DATA_DIR', 'DOCS_DIR', 'OUTPUT_DIR',
+    'API_CONFIG', 'WORDCLOUD_CONFIG', 'DOC_CONFIG', 'LOG_CONFIG',
+    'LLM_CACHE_CONFIG', 'KEYWORDS_CONFIG',
+]
+
 # 项目根目录配置
 ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = ROOT_DIR / "data"
 DOCS_DIR = ROOT_DIR / "docs" 
 OUTPUT_DIR = ROOT_DIR / "output"
 
-# 确保必要的目录存在
-for dir_path in [DATA_DIR, DOCS_DIR, OUTPUT_DIR]:
-    dir_path.mkdir(exist_ok=True)
+# 确保必要的目录存在,目录已存在时只需一次stat调用
+# 设置环境变量WC_SKIP_MKDIR可跳过(如只读部署或测试环境)
+if os.environ.get('WC_SKIP_MKDIR') is None:
+    for dir_path in (DATA_DIR, DOCS_DIR, OUTPUT_DIR):
+        if not dir_path.is_dir():
+            dir_path.mkdir(parents=True, exist_ok=True)
 
 # API配置
 API_CONFIG = {
@@ -50,7 +59,13 @@ WORDCLOUD_CONFIG = {
 # 文档处理配置
 DOC_CONFIG = {
     'supported_formats': ('.doc', '.docx', '.pdf', '.ofd'),
-    'min_text_length': 10
+    'min_text_length': 10,
+    # 并行读取文档的进程数,None表示使用CPU核数
+    'max_workers': None,
+    # 页数达到该值的PDF按页面范围拆分到多个进程并行提取(仅在主进程中单独读取时)
+    'pdf_parallel_min_pages': 200,
+    # 文档文本缓存目录,按文件路径、修改时间和大小缓存提取结果,设为None时关闭
+    'cache_dir': OUTPUT_DIR / 'doc_cache'
 }
 
 # 日志配置
@@ -60,10 +75,20 @@ LOG_CONFIG = {
     'log_file': ROOT_DIR / 'app.log'
 }
 
+# LLM关键词提取结果缓存配置
+LLM_CACHE_CONFIG = {
+    'enabled': True,
+    'cache_dir': OUTPUT_DIR / 'llm_cache',
+    # 语义缓存使用的本地向量模型(sentence-transformers)
+    'semantic_model': 'paraphrase-multilingual-MiniLM-L12-v2'
+}
+
 # 关键词提取配置
 KEYWORDS_CONFIG = {
     'min_freq': 20,
     'max_word_len': 4,
     'specificity_threshold': 1.05,
-    'top_n': 100
+    'top_n': 100,
+    # 语义缓存的余弦相似度阈值,设为None时关闭语义缓存
+    'semantic_cache_threshold': None
 }
\ No newline at end of file
@@ -1,8 +1,16 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+import lxml.html
 import pdfkit
+import html
+import io
 import os
+import tempfile
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 import logging
 import re
@@ -28,26 +36,105 @@ logging.basicConfig(
 
 功能特点:
 - 支持批量下载多页报告
+- 跨页面收集报告后多线程并发下载
 - 自动转换为标准PDF格式
 - 断点续传,避免重复下载
-- 内置请求延迟和失败重试
+- 内置请求限速和失败重试
 - 详细的日志记录
 
 依赖项:
 - requests: 网页抓取
-- beautifulsoup4: 页面解析
+- lxml: 页面解析
 - pdfkit: HTML转PDF
 """
 
+# 报告正文格式化使用的正则,模块加载时编译一次
+BLANK_LINES_PATTERN = re.compile(r'\n\s*\n')
+P_TAG_PATTERN = re.compile(r'<p\b[^>]*>')
+HEAD_TAG_PATTERN = re.compile(rb'<head\b[^>]*>', re.IGNORECASE)
+
+
+class _FilenameTable(dict):
+    """文件名清理使用的str.translate映射表
+
+    保留字母、数字(含中文)、空格、下划线和连字符,其余字符删除。
+    首次遇到某个字符时计算并缓存结果,之后的查找全部在C层完成。
+    """
+
+    def __missing__(self, code):
+        char = chr(code)
+        value = code if char.isalnum() or char in ' _-' else None
+        self[code] = value
+        return value
+
+
+FILENAME_TABLE = _FilenameTable()
+
+
+class RateLimiter:
+    """基于单调时钟的请求限速器
+
+    保证相邻两次请求的间隔不小于1/rate秒。只有实际请求速率超过
+    配额时才会等待,线程安全,可在多个下载线程间共享。
+    """
+
+    def __init__(self, rate):
+        self.min_interval = 1.0 / rate
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """阻塞到下一个可用的请求时间点"""
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.min_interval
+        if delay > 0:
+            time.sleep(delay)
+
+
 class GZReportDownloader:
-    def __init__(self):
+    def __init__(self, max_workers=5, requests_per_second=1.0, max_renders=None):
         self.base_url = "https://www.gz.gov.cn/zwgk/zjgb/gqgzbg/hzq/"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
         self.output_dir = "gz_reports"
+        self.max_workers = max_workers  # 同时下载的报告数量上限
+        # 同时运行的wkhtmltopdf进程数上限,每个进程可能占用约200MB内存
+        self.render_semaphore = threading.BoundedSemaphore(max_renders or min(4, os.cpu_count() or 1))
+        self.rate_limiter = RateLimiter(requests_per_second)  # 所有请求共享的限速器
+        self.session = self._create_session()
+        # 只解析一次wkhtmltopdf路径,避免pdfkit每次转换都启动which子进程
+        self.pdfkit_config = pdfkit.configuration()
+        self.pdf_options = {
+            'encoding': 'UTF-8',
+            'quiet': '',
+            'margin-top': '1.5cm',
+            'margin-right': '1.5cm',
+            'margin-bottom': '1.5cm',
+            'margin-left': '1.5cm',
+            'enable-local-file-access': None,
+            'disable-javascript': None,
+            'minimum-font-size': 12,
+            'zoom': 1.2,  # 提高PDF清晰度
+            'page-size': 'A4'
+        }
         self.ensure_output_dir()
 
+    def _create_session(self):
+        """创建复用TCP/TLS连接的会话,并对网关类错误自动重试"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=max(8, self.max_workers),
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     def ensure_output_dir(self):
         """确保输出目录存在"""
         if not os.path.exists(self.output_dir):
@@ -55,44 +142,67 @@ class GZReportDownloader:
             logging.info(f"创建输出目录: {self.output_dir}")
 
     def get_page_content(self, url):
-        """获取页面内容"""
+        """获取页面内容,返回原始字节,由lxml在C层完成解码"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            self.rate_limiter.wait()
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            response.encoding = 'utf-8'
-            return response.text
+            return response.content
         except requests.RequestException as e:
             logging.error(f"获取页面失败: {url}, 错误: {str(e)}")
             return None
 
     def parse_report_links(self, html_content):
-        """解析页面中的报告链接"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        """解析页面中的报告链接
+        
+        使用lxml.etree.iterparse流式解析,只在<a>标签结束时处理,
+        处理完立即清理已解析的节点,不构建完整的文档树。
+        
+        Args:
+            html_content: bytes, 页面原始字节
+            
+        Returns:
+            List[Dict]: 报告列表,每项包含title和url
+        """
         reports = []
-
-        # 根据实际HTML结构选择正确的选择器
-        for link in soup.select('.news_list li a'):
-            title = link.get_text(strip=True)
-            url = urljoin(self.base_url, link.get('href'))
-            if title and url:
-                reports.append({
-                    'title': title.strip(),
-                    'url': url
-                })
-                logging.info(f"找到报告: {title}")
+        # 站点页面均为UTF-8编码,与原先强制设置response.encoding一致
+        for _, link in etree.iterparse(io.BytesIO(html_content), events=('end',), tag='a',
+                                       html=True, encoding='utf-8'):
+            if self._in_report_list(link):
+                title = ''.join(text.strip() for text in link.itertext())
+                href = link.get('href')
+                if title and href:
+                    reports.append({
+                        'title': title,
+                        'url': urljoin(self.base_url, href)
+                    })
+                    logging.info(f"找到报告: {title}")
+
+            # 清理已处理的节点,释放内存
+            link.clear(keep_tail=True)
+            while link.getprevious() is not None:
+                del link.getparent()[0]
         return reports
 
+    @staticmethod
+    def _in_report_list(link):
+        """判断链接是否匹配CSS选择器'.news_list li a'"""
+        for ancestor in link.iterancestors('li'):
+            return any('news_list' in (el.get('class') or '').split()
+                       for el in ancestor.iterancestors())
+        return False
+
     def download_report_as_pdf(self, report):
         """下载政府工作报告并转换为PDF格式保存
         
         处理逻辑:
         1. 清理文件名,移除非法字符
         2. 检查文件是否已存在(避免重复下载)
-        3. 配置PDF生成参数:
+        3. 通过共享会话获取报告页面,写入临时HTML文件
+        4. 使用pdfkit将临时文件转换为PDF,转换参数(self.pdf_options):
            - 设置页面边距和字体
            - 配置页面大小和缩放
            - 启用必要的转换选项
-        4. 使用pdfkit将网页转换为PDF
         
         Args:
             report: Dict, 报告信息字典
@@ -114,11 +224,11 @@ class GZReportDownloader:
                 - 优化字体大小
                 - 调整缩放比例
             4. 下载过程的状态会记录到日志
+            5. 页面由会话统一获取,wkhtmltopdf不再重复请求页面本身,
+               页面中插入<base>标签以保证相对路径的资源可以加载
         """
         try:
-            # 清理文件名，移除非法字符
-            safe_title = "".join(x for x in report['title'] if x.isalnum() or x in (' ', '_', '-'))
-            filename = f"{safe_title}.pdf"
+            filename = f"{self._safe_filename(report['title'])}.pdf"
             filepath = os.path.join(self.output_dir, filename)
 
             # 如果文件已存在，跳过下载
@@ -126,100 +236,136 @@ class GZReportDownloader:
                 logging.info(f"文件已存在，跳过: {filename}")
                 return True
 
-            # 配置pdfkit选项
-            options = {
-                'encoding': 'UTF-8',
-                'custom-header': [
-                    ('User-Agent', self.headers['User-Agent'])
-                ],
-                'quiet': '',
-                'margin-top': '1.5cm',
-                'margin-right': '1.5cm',
-                'margin-bottom': '1.5cm',
-                'margin-left': '1.5cm',
-                'enable-local-file-access': None,
-                'disable-javascript': None,
-                'minimum-font-size': 12,
-                'zoom': 1.2,  # 提高PDF清晰度
-                'page-size': 'A4'
-            }
-
             logging.info(f"正在下载: {report['url']}")
+            html_content = self.get_page_content(report['url'])
+            if not html_content:
+                return False
 
             # 转换为PDF
-            pdfkit.from_url(report['url'], filepath, options=options)
+            fd, tmp_path = tempfile.mkstemp(suffix='.html')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    tmp.write(self._with_base_url(html_content, report['url']))
+                with self.render_semaphore:
+                    pdfkit.from_file(tmp_path, filepath,
+                                     options=self.pdf_options, configuration=self.pdfkit_config)
+            finally:
+                os.remove(tmp_path)
             logging.info(f"成功下载: {filename}")
+            return True
         except Exception as e:
             logging.error(f"下载失败: {report['title']}, 错误: {str(e)}")
             return False
 
+    @staticmethod
+    def _safe_filename(title):
+        """清理文件名，移除非法字符"""
+        return title.translate(FILENAME_TABLE)
+
+    @staticmethod
+    def _with_base_url(html_content, url):
+        """在<head>中插入<base>标签,使本地渲染时相对路径仍指向原站点"""
+        base_tag = f'<base href="{html.escape(url)}">'.encode('utf-8')
+        match = HEAD_TAG_PATTERN.search(html_content)
+        if match is None:
+            return base_tag + html_content
+        return html_content[:match.end()] + base_tag + html_content[match.end():]
+
     def _process_content(self, title, content):
-        """处理报告内容，进行格式化"""
+        """处理报告内容，进行格式化
+        
+        Args:
+            title: lxml.html.HtmlElement, 标题节点
+            content: lxml.html.HtmlElement, 正文节点
+            
+        Returns:
+            str: 格式化后的HTML片段
+        """
         # 移除script标签等非内容元素
-        [s.extract() for s in content.select('script, style')]
+        for element in content.xpath('.//script | .//style'):
+            element.drop_tree()
 
         # 处理标题
-        title_text = title.get_text(strip=True)
+        title_text = ''.join(text.strip() for text in title.itertext())
 
         # 处理正文内容，保持段落格式
-        content_html = str(content)
+        content_html = lxml.html.tostring(content, encoding='unicode')
 
         # 去除多余的空白行
-        content_html = re.sub(r'\n\s*\n', '\n', content_html)
+        content_html = BLANK_LINES_PATTERN.sub('\n', content_html)
 
         # 替换特定标签为HTML标签
         content_html = content_html.replace('<strong>', '<b>').replace('</strong>', '</b>')
 
         # 处理段落缩进
-        content_html = re.sub(r'<p.*?>', '<p>', content_html)
+        content_html = P_TAG_PATTERN.sub('<p>', content_html)
 
         return f"<h1>{title_text}</h1>{content_html}"
 
     def process_page(self, page_num):
-        """处理单个页面的文章列表
+        """解析单个页面的文章列表
         
         处理逻辑:
         1. 根据页码构造URL地址
         2. 获取页面HTML内容
         3. 解析页面中的报告链接
-        4. 下载每个报告并转换为PDF
         
         Args:
             page_num: int, 页码
             
         Returns:
-            bool: 是否处理成功
-            - True: 页面存在且成功处理
-            - False: 页面不存在或处理失败
+            List[Dict]: 页面中的报告列表,页面不存在或处理失败时为空列表
         """
         url = f"{self.base_url}index_{page_num}.html" if page_num > 1 else self.base_url
         logging.info(f"处理页面: {url}")
 
         html_content = self.get_page_content(url)
         if not html_content:
-            return False
+            return []
 
         reports = self.parse_report_links(html_content)
         if not reports:
             logging.warning(f"页面未找到报告链接: {url}")
-            return False
-
-        for report in reports:
-            self.download_report_as_pdf(report)
-            time.sleep(2)  # 添加延时，避免请求过于频繁
+        return reports
 
-        return True
+    def download_reports(self, reports):
+        """使用线程池并发下载所有报告并转换为PDF
+        
+        页面获取和PDF渲染在同一线程池中重叠进行:wkhtmltopdf在子进程中
+        运行,不占用GIL;同时渲染的进程数由self.render_semaphore限制。
+        
+        Args:
+            reports: List[Dict], 跨页面收集的全部报告
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self.download_report_as_pdf, reports))
+        logging.info(f"报告下载完成: 成功 {sum(1 for r in results if r)}/{len(reports)}")
 
     def run(self, start_page=1, end_page=2):
-        """运行下载器"""
+        """运行下载器
+        
+        先收集所有页面的报告链接,再统一批量下载,使并发下载
+        不受页面边界限制。多个页面列出的同一报告(文件名相同)只下载一次。
+        """
         logging.info("开始下载政府工作报告...")
 
+        all_reports = []
+        seen = set()
         for page_num in range(start_page, end_page + 1):
-            if not self.process_page(page_num):
+            reports = self.process_page(page_num)
+            if not reports:
                 logging.warning(f"页面 {page_num} 处理失败或已到达最后一页")
                 break
-            time.sleep(3)  # 页面间延时
+            for report in reports:
+                safe_title = self._safe_filename(report['title'])
+                if safe_title not in seen:
+                    seen.add(safe_title)
+                    all_reports.append(report)
+
+        logging.info(f"共找到 {len(all_reports)} 个报告,开始下载")
+        self.download_reports(all_reports)
 
+        self.session.close()
         logging.info("下载任务完成")
 
 
@@ -3,9 +3,10 @@
 整体处理逻辑:
 1. 支持多种LLM服务(Deepseek/Ollama)的API调用
 2. 根据输入文本构建提示词(Prompt)
-3. 发送API请求获取关键词列表
-4. 验证并标准化API返回的结果格式
-5. 为每个关键词分配权重值(0-1)
+3. 查询本地缓存,命中时跳过API调用
+4. 发送API请求获取关键词列表
+5. 验证并标准化API返回的结果格式
+6. 为每个关键词分配权重值(0-1)
 
 支持的LLM服务:
 - Deepseek Chat: 基于Deepseek商业API
@@ -13,41 +14,251 @@
 
 依赖项:
 - requests: API请求
-- json: 结果解析
+- orjson: 请求体序列化和结果解析
+- pydantic: 关键词列表格式校验
 """
 
 from typing import Dict, List, Any, Optional
-import json
+import textwrap
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from pydantic import Field, Strict, TypeAdapter, ValidationError
+from typing_extensions import Annotated, TypedDict
 from config import API_CONFIG
 from utils import logger
+import llm_extractor_cache
+
+# 提示词版本号,修改提示词后需要递增,使旧的缓存结果失效
+PROMPT_VERSION = 'v4'
+
+# 提示词模板在模块加载时构建一次,调用时只插入排除关键词
+PROMPT_PREFIX = textwrap.dedent("""\
+    你是一位专业的文本分析专家，请从以下文本中提取最重要的关键词，用于生成词云图。
+    ## 任务要求
+    1. 排除无实际意义的虚词、介词、连词等停用词
+    2. 考虑词语在文本中的重要程度（词频+语义重要性）
+    3. 以JSON格式返回结果，每个关键词条目包含关键词和其权重值，结构见输出格式
+    4. 不统计需要排除的关键词
+    5. 提取至少100个关键词
+
+""")
+
+PROMPT_EXCLUDE_FORMAT = "## 需要排除的关键词\n{}\n\n"
+
+# 输出格式段落:默认要求顶层为数组;
+# 开启JSON对象输出模式的接口(Deepseek)要求将数组包装在keywords字段中
+PROMPT_FORMAT_ARRAY = textwrap.dedent("""\
+    ## 输出格式
+    请严格按照以下JSON格式返回结果：
+    ```json
+    [
+      {"keyword": "关键词1", "weight": 0.7},
+      {"keyword": "关键词2", "weight": 0.5},
+      {"keyword": "关键词3", "weight": 0.3}
+    ]
+    ```
+
+""")
+
+PROMPT_FORMAT_OBJECT = textwrap.dedent("""\
+    ## 输出格式
+    请严格按照以下JSON格式返回结果，关键词数组放在keywords字段中：
+    ```json
+    {
+      "keywords": [
+        {"keyword": "关键词1", "weight": 0.7},
+        {"keyword": "关键词2", "weight": 0.5},
+        {"keyword": "关键词3", "weight": 0.3}
+      ]
+    }
+    ```
+
+""")
+
+PROMPT_SUFFIX = textwrap.dedent("""\
+    ## 权重计算规则
+    - 权重范围：0-1，1为最高重要性
+    - 考虑因素：词频、词语长度、语义重要性、专有名词优先级
+    - 通用词、常见动词、形容词应适当降低权重
+
+    ## 处理步骤
+    1. 先通读全文理解主题和内容
+    2. 识别并提取关键词
+    3. 计算每个关键词的重要性权重
+    4. 按照输出格式返回JSON结果
+
+    请直接返回JSON结果，不要添加任何解释或其他文本。
+""")
+
+# Ollama输出格式不正确时,重试请求中置于原文之前的纠正说明
+CORRECTION_PROMPT = textwrap.dedent("""\
+    上一次提取结果格式不正确。请严格按照以下JSON格式返回结果：
+    [
+        {"keyword": "关键词1", "weight": 权重值},
+        {"keyword": "关键词2", "weight": 权重值}
+    ]
+
+    原始文本:
+""")
+
+
+class KeywordItem(TypedDict):
+    """LLM返回的单个关键词及其权重"""
+    keyword: Annotated[str, Strict()]
+    weight: Annotated[float, Strict(), Field(ge=0, le=1)]
+
+
+class KeywordsObject(TypedDict):
+    """JSON对象输出模式下的响应结构"""
+    keywords: List[KeywordItem]
+
+
+# 关键词列表校验器,模块加载时构建一次,解析和校验在pydantic-core中一次完成
+KEYWORDS_ADAPTER = TypeAdapter(List[KeywordItem])
+KEYWORDS_OBJECT_ADAPTER = TypeAdapter(KeywordsObject)
+
+# 关键词列表的JSON Schema,用于Ollama的结构化输出约束解码
+KEYWORDS_SCHEMA = {
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'properties': {
+            'keyword': {'type': 'string'},
+            'weight': {'type': 'number', 'minimum': 0, 'maximum': 1}
+        },
+        'required': ['keyword', 'weight']
+    }
+}
 
 class BaseLLMExtractor:
-    """LLM提取器基类"""
+    """LLM提取器基类
+    
+    所有API请求共用一个requests.Session,在多个文档之间复用TCP/TLS连接。
+    支持with语句,退出时关闭连接池。
+    """
     
+    # 提示词中的输出格式段落,子类可替换为其他结构
+    PROMPT_FORMAT = PROMPT_FORMAT_ARRAY
+    
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self) -> None:
+        """关闭HTTP连接池,并保存本批次新增的语义缓存条目"""
+        self.session.close()
+        llm_extractor_cache.flush_semantic_cache()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def model_id(self) -> str:
+        """模型标识,作为缓存键的一部分"""
+        raise NotImplementedError
+
     def extract_keywords(self, text: str, exclude_keywords: set) -> List[Dict[str, Any]]:
-        """提取关键词的抽象方法"""
+        """提取关键词,优先使用本地缓存结果
+        
+        处理逻辑:
+        1. 根据文本、排除词、模型和提示词版本计算缓存键
+        2. 命中缓存时直接返回缓存结果
+        3. 启用语义缓存时,查找内容相近文档的提取结果
+        4. 均未命中时调用_extract_uncached()请求LLM
+        5. 将非空结果写入缓存
+        
+        Args:
+            text: str, 输入文本
+            exclude_keywords: set, 需要排除的关键词
+            
+        Returns:
+            List[Dict[str, Any]]: 关键词列表,提取失败时返回空列表
+        """
+        key = llm_extractor_cache.make_key(text, exclude_keywords, self.model_id, PROMPT_VERSION)
+        keywords = llm_extractor_cache.get(key)
+        if keywords is not None:
+            logger.info(f"LLM cache hit: {key[:12]}")
+            return keywords
+
+        semantic_cache = llm_extractor_cache.get_semantic_cache()
+        embedding = None
+        if semantic_cache is not None:
+            context = llm_extractor_cache.make_context_key(exclude_keywords, self.model_id, PROMPT_VERSION)
+            try:
+                embedding = semantic_cache.embed(text)
+                keywords = semantic_cache.lookup(embedding, context)
+            except Exception as e:
+                # 语义缓存是可选优化,向量模型不可用(如离线无法下载)时按未命中处理
+                logger.warning(f"Semantic cache lookup failed: {str(e)}")
+                embedding = None
+                keywords = None
+            if keywords is not None:
+                llm_extractor_cache.put(key, keywords)
+                return keywords
+
+        keywords = self._extract_uncached(text, exclude_keywords)
+        if keywords:
+            llm_extractor_cache.put(key, keywords)
+            if embedding is not None:
+                semantic_cache.add(embedding, context, keywords)
+        return keywords
+
+    def _extract_uncached(self, text: str, exclude_keywords: set) -> List[Dict[str, Any]]:
+        """调用LLM API提取关键词的抽象方法"""
         raise NotImplementedError
         
-    def _validate_keywords(self, keywords: List[Dict[str, Any]]) -> bool:
-        """验证LLM返回的关键词列表是否符合预期格式
+    def _build_prompt(self, exclude_keywords: set) -> str:
+        """构建用于LLM API的系统提示词
+        
+        处理逻辑:
+        1. 使用模块加载时构建好的静态前缀、输出格式(self.PROMPT_FORMAT)和后缀
+        2. 仅在存在排除关键词时插入排除关键词段落
+        3. 提示词不含缩进空白,避免浪费token
+        
+        提示词组成:
+        1. 任务要求:提取至少100个关键词并赋权重
+        2. 排除关键词:不参与统计的关键词(可选)
+        3. 输出格式:由self.PROMPT_FORMAT给出JSON结构示例(数组或keywords对象)
+        4. 权重规则:权重值限定在0-1之间
+        5. 处理步骤:先通读全文再提取关键词
+        
+        Args:
+            exclude_keywords: set, 需要排除的关键词
+            
+        Returns:
+            str: 完整的系统提示词,待分析文本作为user消息单独发送
+        """
+        if not exclude_keywords:
+            return PROMPT_PREFIX + self.PROMPT_FORMAT + PROMPT_SUFFIX
+        exclude = PROMPT_EXCLUDE_FORMAT.format(','.join(exclude_keywords))
+        return PROMPT_PREFIX + exclude + self.PROMPT_FORMAT + PROMPT_SUFFIX
+
+    def _parse_keywords(self, content: str) -> Optional[List[Dict[str, Any]]]:
+        """从LLM响应文本中解析并验证关键词列表
+        
+        处理逻辑:
+        1. 使用_extract_json_array()截取JSON数组部分
+        2. 使用预编译的KEYWORDS_ADAPTER一次完成JSON解析和格式校验
         
         验证规则:
-        1. 检查输入是否为列表类型
-        2. 检查每个元素是否为字典类型
-        3. 验证字典是否包含必需的key
-           - keyword: 关键词文本
-           - weight: 权重值
-        4. 验证关键词是否为字符串类型
-        5. 验证权重是否为数值类型且在0-1之间
+        1. 顶层必须为列表,每个元素必须为对象
+        2. 对象必须包含keyword和weight两个key
+        3. keyword必须为字符串类型
+        4. weight必须为数值类型且在0-1之间
         
         Args:
-            keywords: List[Dict[str, Any]], 待验证的关键词列表
+            content: str, LLM返回的完整响应文本
             
         Returns:
-            bool: 验证结果
-                - True: 完全符合格式要求
-                - False: 存在任何格式错误
+            Optional[List[Dict[str, Any]]]: 验证通过的关键词列表,
+                JSON无效或存在任何格式错误时返回None
                 
         示例:
             有效的关键词列表格式:
@@ -56,21 +267,10 @@ class BaseLLMExtractor:
                 {"keyword": "科技创新", "weight": 0.88}  
             ]
         """
-        if not isinstance(keywords, list):
-            return False
-            
-        for item in keywords:
-            if not isinstance(item, dict):
-                return False
-            if 'keyword' not in item or 'weight' not in item:
-                return False
-            if not isinstance(item['keyword'], str):
-                return False
-            if not isinstance(item['weight'], (int, float)):
-                return False
-            if not 0 <= item['weight'] <= 1:
-                return False
-        return True
+        try:
+            return KEYWORDS_ADAPTER.validate_json(self._extract_json_array(content))
+        except ValidationError:
+            return None
 
     def _extract_json_array(self, text: str) -> str:
         """从LLM响应文本中提取JSON数组字符串
@@ -97,9 +297,23 @@ class BaseLLMExtractor:
         return text
 
 class DeepseekExtractor(BaseLLMExtractor):
-    """基于Deepseek的关键词提取器"""
+    """基于Deepseek的关键词提取器
     
-    def extract_keywords(self, text: str, exclude_keywords: set) -> List[Dict[str, Any]]:
+    开启JSON对象输出模式,提示词要求将关键词数组包装在keywords字段中
+    """
+    
+    MODEL = 'deepseek-chat'
+    PROMPT_FORMAT = PROMPT_FORMAT_OBJECT
+
+    def __init__(self):
+        super().__init__()
+        self.session.headers['Authorization'] = f"Bearer {API_CONFIG['DEEPSEEK_API_KEY']}"
+
+    @property
+    def model_id(self) -> str:
+        return self.MODEL
+
+    def _extract_uncached(self, text: str, exclude_keywords: set) -> List[Dict[str, Any]]:
         """使用Deepseek API提取关键词
         
         Args:
@@ -111,25 +325,17 @@ class DeepseekExtractor(BaseLLMExtractor):
             :param exclude_keywords: 排除词
         """
         try:
-            headers = {
-                'Authorization': f"Bearer {API_CONFIG['DEEPSEEK_API_KEY']}",
-                'Content-Type': 'application/json'
-            }
-
             prompt = self._build_prompt(exclude_keywords)
-            response = requests.post(
+            response = self.session.post(
                 f"{API_CONFIG['DEEPSEEK_API_BASE']}/chat/completions",
-                headers=headers,
-                json=self._build_request_body(prompt, text),
+                data=orjson.dumps(self._build_request_body(prompt, text)),
                 timeout=60
             )
 
             if response.status_code == 200:
-                result = response.json()['choices'][0]['message']['content']
-                json_content = self._extract_json_array(result)
-                keywords = json.loads(json_content)
-                
-                if self._validate_keywords(keywords):
+                result = orjson.loads(response.content)['choices'][0]['message']['content']
+                keywords = self._parse_keywords(result)
+                if keywords is not None:
                     return keywords
                     
             logger.error(f"Deepseek API error: {response.text}")
@@ -142,78 +348,12 @@ class DeepseekExtractor(BaseLLMExtractor):
             logger.error(f"Error extracting keywords with Deepseek: {str(e)}")
             return []
             
-    def _build_prompt(self, exclude_keywords: set) -> str:
-        """构建用于LLM API的提示词模板
-        
-        处理逻辑:
-        1. 使用预定义的提示词模板,优化API的输出质量
-        2. 指定关键词提取的任务要求,包括需要的数量(10-15)
-        3. 给出严格的JSON格式限制,确保结果一致性
-        4. 添加权重赋值要求(0-1区间)
-        5. 附加完整的示例说明,增强提示词可理解性
-        
-        提示词组成:
-        1. 任务目标:提取10-15个关键词并赋权重
-        2. 格式要求:JSON Array格式,并给出示例结构
-        3. 数值规范:权重值限定在0-1之间
-        4. 示例结果:包含正确的格式和典型内容
-        5. 输入内容:待分析的文本数据
-        
-        Args:
-            text: str, 待分析的具体文本内容
-            
-        Returns:
-            str: 完整的提示词字符串,可直接用于API调用
-            
-        示例:
-            输入文本: "人工智能技术飞速发展..."
-            
-            生成的提示词:
-            ```
-            请根据以下文本,提取10-15个最重要的核心关键词...
-            [
-                {"keyword": "关键词1", "weight": 0.9},
-                {"keyword": "关键词2", "weight": 0.85}
-            ]
-            文本内容:
-            人工智能技术飞速发展...
-            ```
-        """
-        return f'''
-                你是一位专业的文本分析专家，请从以下文本中提取最重要的关键词，用于生成词云图。
-                    ## 任务要求
-                    1. 排除无实际意义的虚词、介词、连词等停用词
-                    2. 考虑词语在文本中的重要程度（词频+语义重要性）
-                    3. 返回格式为JSON数组，每个元素包含关键词和其权重值
-                    4. 不统计需要排除的关键词
-                    5. 提取至少100个关键词
-                    
-                    ## 需要排除的关键词
-                    {','.join(exclude_keywords)}
-                    
-                    ## 输出格式
-                    请严格按照以下JSON格式返回结果：
-                    ```json
-                    [
-                      {{"keyword": "关键词1", "weight": 0.7}},
-                      {{"keyword": "关键词2", "weight": 0.5}},
-                      {{"keyword": "关键词3", "weight": 0.3}}
-                    ]
-                    ```
-                    
-                    ## 权重计算规则
-                    - 权重范围：0-1，1为最高重要性
-                    - 考虑因素：词频、词语长度、语义重要性、专有名词优先级
-                    - 通用词、常见动词、形容词应适当降低权重
-                    
-                    ## 处理步骤
-                    1. 先通读全文理解主题和内容
-                    2. 识别并提取关键词
-                    3. 计算每个关键词的重要性权重
-                    4. 返回JSON格式的关键词数组
-                    
-                    请直接返回JSON结果，不要添加任何解释或其他文本。
-                '''
+    def _parse_keywords(self, content: str) -> Optional[List[Dict[str, Any]]]:
+        """解析JSON对象模式的响应,返回keywords字段中验证通过的关键词列表"""
+        try:
+            return KEYWORDS_OBJECT_ADAPTER.validate_json(content)['keywords']
+        except ValidationError:
+            return None
             
     def _build_request_body(self, prompt: str, text: str) -> Dict:
         """构建用于API调用的请求体参数
@@ -236,6 +376,8 @@ class DeepseekExtractor(BaseLLMExtractor):
         3. temperature: 控制输出随机性的温度值
             - 0.3: 低温设定,保证输出稳定性
             - 仍保留适度变化空间
+        4. response_format: 开启JSON输出模式,保证返回合法JSON
+            - JSON模式下模型返回{"keywords": [...]}对象,由_parse_keywords()校验
             
         Args:
             prompt: str, 经过格式化的完整提示词
@@ -245,6 +387,7 @@ class DeepseekExtractor(BaseLLMExtractor):
                 - model: str, 模型标识符
                 - messages: List[Dict], 对话消息列表
                 - temperature: float, 生成参数
+                - response_format: Dict, 输出格式约束
                 
         示例:
             >>> prompt = "分析以下文本..."
@@ -256,24 +399,41 @@ class DeepseekExtractor(BaseLLMExtractor):
                     {'role': 'system', 'content': '...'},
                     {'role': 'user', 'content': '...'}
                 ],
-                'temperature': 0.3
+                'temperature': 0.3,
+                'response_format': {'type': 'json_object'}
             }
         """
         return {
-            'model': 'deepseek-chat',
+            'model': self.MODEL,
             'messages': [
                 {'role': 'system', 'content': prompt},
                 {'role': 'user', 'content': text},
             ],
-            'temperature': 0.3
+            'temperature': 0.3,
+            'response_format': {'type': 'json_object'}
         }
 
 class OllamaExtractor(BaseLLMExtractor):
-    """基于Ollama的关键词提取器"""
+    """基于Ollama的关键词提取器
     
-    MAX_RETRIES = 5
+    请求中携带关键词列表的JSON Schema,由Ollama约束解码直接输出
+    符合格式的结果。重试主要用于网络错误,以及输出被截断等
+    仍未通过校验的少数情况。0.5之前的Ollama不支持Schema形式的
+    format参数(返回400),此时自动回退为'json'模式。
+    """
     
-    def extract_keywords(self, text: str, exclude_keywords: set) -> List[Dict[str, Any]]:
+    MAX_RETRIES = 2
+
+    def __init__(self):
+        super().__init__()
+        # 服务端是否支持JSON Schema形式的format参数,收到400后置为False
+        self.schema_format = True
+    
+    @property
+    def model_id(self) -> str:
+        return API_CONFIG['OLLAMA_MODEL']
+
+    def _extract_uncached(self, text: str, exclude_keywords: set) -> List[Dict[str, Any]]:
         """使用Ollama API提取关键词
         
         Args:
@@ -285,104 +445,62 @@ class OllamaExtractor(BaseLLMExtractor):
             :param exclude_keywords:
         """
         messages = [
-            {
-                'role': 'system',
-                'content': f'''
-                你是一位专业的文本分析专家，请从以下文本中提取最重要的关键词，用于生成词云图。
-                    ## 任务要求
-                    1. 排除无实际意义的虚词、介词、连词等停用词
-                    2. 考虑词语在文本中的重要程度（词频+语义重要性）
-                    3. 返回格式为JSON数组，每个元素包含关键词和其权重值
-                    4. 不统计需要排除的关键词
-                    5. 提取至少100个关键词
-                    
-                    ## 需要排除的关键词
-                    {','.join(exclude_keywords)}
-                    
-                    ## 输出格式
-                    请严格按照以下JSON格式返回结果：
-                    ```json
-                    [
-                      {{"keyword": "关键词1", "weight": 0.7}},
-                      {{"keyword": "关键词2", "weight": 0.2}},
-                      {{"keyword": "关键词3", "weight": 0.1}}
-                    ]
-                    ```
-                    
-                    ## 权重计算规则
-                    - 权重范围：0-1，1为最高重要性
-                    - 考虑因素：词频、词语长度、语义重要性、专有名词优先级
-                    - 通用词、常见动词、形容词应适当降低权重
-                    
-                    ## 处理步骤
-                    1. 先通读全文理解主题和内容
-                    2. 识别并提取关键词
-                    3. 计算每个关键词的重要性权重
-                    4. 返回JSON格式的关键词数组
-                    
-                    请直接返回JSON结果，不要添加任何解释或其他文本。
-                    
-                    ## 文本内容
-                    {text}
-                '''
-            }
+            {'role': 'system', 'content': self._build_prompt(exclude_keywords)},
+            {'role': 'user', 'content': text},
         ]
 
         try:
-            headers = {'Content-Type': 'application/json'}
-
             for attempt in range(self.MAX_RETRIES):
-                response = requests.post(
-                    f"{API_CONFIG['OLLAMA_API_BASE']}/api/chat",
-                    headers=headers,
-                    json=self._build_request_body(messages),
-                    timeout=60
-                )
+                try:
+                    response = self._post(messages)
+                except requests.exceptions.RequestException as e:
+                    logger.error(f"Ollama API request failed (attempt {attempt + 1}): {str(e)}")
+                    continue
 
                 if response.status_code != 200:
                     logger.error(f"Ollama API error: {response.text}")
                     continue
 
-                result = response.json()['message']['content']
-                json_content = self._extract_json_array(result)
-
-                try:
-                    keywords = json.loads(json_content)
-                    if self._validate_keywords(keywords):
-                        return keywords
-                except json.JSONDecodeError:
-                    pass
+                result = orjson.loads(response.content)['message']['content']
+                keywords = self._parse_keywords(result)
+                if keywords is not None:
+                    return keywords
 
                 if attempt < self.MAX_RETRIES - 1:
-                    messages.extend([
-                        {'role': 'assistant', 'content': result},
-                        {'role': 'user', 'content': self._build_correction_prompt()}
-                    ])
+                    # 重试时只发送系统提示词和带纠正说明的原文,不附带错误回复,
+                    # 避免每次重试的上传内容成倍增长
+                    messages = [
+                        messages[0],
+                        {'role': 'user', 'content': self._build_correction_prompt() + text}
+                    ]
                     logger.info(f"Retry {attempt + 1}: Invalid format, attempting correction")
 
             logger.error("Maximum retries reached, failed to get valid response")
             return []
 
-        except requests.exceptions.Timeout:
-            logger.error("Ollama API timeout")
-            return []
         except Exception as e:
             logger.error(f"Error extracting keywords with Ollama: {str(e)}")
             return []
             
+    def _post(self, messages: List[Dict]) -> requests.Response:
+        """发送chat请求,服务端不支持Schema形式的format时回退为'json'模式并重发一次"""
+        url = f"{API_CONFIG['OLLAMA_API_BASE']}/api/chat"
+        response = self.session.post(url, data=orjson.dumps(self._build_request_body(messages)), timeout=60)
+        if response.status_code == 400 and self.schema_format:
+            logger.warning(f"Ollama rejected JSON schema format, falling back to 'json': {response.text}")
+            self.schema_format = False
+            response = self.session.post(url, data=orjson.dumps(self._build_request_body(messages)), timeout=60)
+        return response
+            
     def _build_correction_prompt(self) -> str:
-        """构建纠正提示词"""
-        return """你的上一次回复格式不正确。请严格按照以下JSON格式返回结果：
-            [
-                {"keyword": "关键词1", "weight": 权重值},
-                {"keyword": "关键词2", "weight": 权重值}
-            ]
-            """
+        """构建纠正提示词,重试时作为原文的前缀发送"""
+        return CORRECTION_PROMPT
             
     def _build_request_body(self, messages: List[Dict]) -> Dict:
-        """构建请求体"""
+        """构建请求体,通过format字段约束输出符合KEYWORDS_SCHEMA(不支持时仅约束为JSON)"""
         return {
             'model': API_CONFIG['OLLAMA_MODEL'],
             'messages': messages,
+            'format': KEYWORDS_SCHEMA if self.schema_format else 'json',
             'stream': False
         }
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""LLM关键词提取结果缓存模块
+
+整体处理逻辑:
+1. 根据文本内容、排除词、模型标识和提示词版本计算SHA-256缓存键
+2. 命中缓存时直接读取本地缓存文件,跳过LLM API调用
+3. 精确缓存未命中时,可选地通过语义缓存查找内容相近的文档
+4. 均未命中时由调用方请求LLM,并将有效结果写入缓存
+
+缓存文件存放在LLM_CACHE_CONFIG['cache_dir']目录下,文件名为缓存键,
+内容为gzip压缩的msgpack数据(未安装msgpack时回退为JSON)。
+修改提示词时需同步更新提示词版本号,使旧缓存自动失效。
+
+语义缓存默认关闭,在KEYWORDS_CONFIG['semantic_cache_threshold']中
+设置相似度阈值后启用。
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import orjson
+
+from config import LLM_CACHE_CONFIG, KEYWORDS_CONFIG
+from utils import logger
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+CACHE_DIR = Path(LLM_CACHE_CONFIG['cache_dir'])
+
+# 序列化格式,文件后缀区分格式,避免不同环境间误读
+if msgpack is not None:
+    CACHE_SUFFIX = '.msgpack.gz'
+    _serialize = msgpack.packb
+    _deserialize = msgpack.unpackb
+else:
+    CACHE_SUFFIX = '.json.gz'
+    _serialize = orjson.dumps
+    _deserialize = orjson.loads
+
+
+def make_key(text: str, exclude_keywords: Iterable[str], model_id: str, prompt_version: str) -> str:
+    """计算内容寻址的缓存键
+    
+    Args:
+        text: str, 待提取关键词的文本
+        exclude_keywords: Iterable[str], 需要排除的关键词
+        model_id: str, 模型标识
+        prompt_version: str, 提示词版本号
+        
+    Returns:
+        str: 十六进制SHA-256摘要
+        
+    注意:
+        排除词会先排序,保证集合迭代顺序不影响缓存键
+    """
+    h = hashlib.sha256()
+    encoded = text.encode('utf-8')
+    h.update(len(encoded).to_bytes(8, 'little'))
+    h.update(encoded)
+    h.update(b'|')
+    h.update(','.join(sorted(exclude_keywords)).encode('utf-8'))
+    h.update(b'|')
+    h.update(model_id.encode('utf-8'))
+    h.update(b'|')
+    h.update(prompt_version.encode('utf-8'))
+    return h.hexdigest()
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}{CACHE_SUFFIX}"
+
+
+def get(key: str) -> Optional[List[Dict[str, Any]]]:
+    """读取缓存的关键词列表
+    
+    Args:
+        key: str, make_key()生成的缓存键
+        
+    Returns:
+        Optional[List[Dict[str, Any]]]: 缓存的关键词列表,未命中或读取失败时返回None
+    """
+    if not LLM_CACHE_CONFIG['enabled']:
+        return None
+
+    path = _cache_path(key)
+    try:
+        with open(path, 'rb') as f:
+            return _deserialize(gzip.decompress(f.read()))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to read LLM cache {path}: {str(e)}")
+        return None
+
+
+def put(key: str, keywords: List[Dict[str, Any]]) -> None:
+    """写入关键词列表到缓存
+    
+    先写入临时文件再原子替换,避免中断时留下不完整的缓存文件。
+    
+    Args:
+        key: str, make_key()生成的缓存键
+        keywords: List[Dict[str, Any]], LLM返回并已验证的关键词列表
+    """
+    if not LLM_CACHE_CONFIG['enabled']:
+        return
+
+    path = _cache_path(key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(_serialize(keywords)))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Failed to write LLM cache {path}: {str(e)}")
+
+
+def make_context_key(exclude_keywords: Iterable[str], model_id: str, prompt_version: str) -> str:
+    """计算不含文本内容的提取上下文键
+    
+    语义缓存只在排除词、模型和提示词版本都相同的条目之间匹配。
+    """
+    return make_key('', exclude_keywords, model_id, prompt_version)
+
+
+class SemanticCache:
+    """基于文本向量相似度的关键词缓存
+    
+    处理逻辑:
+    1. 将文档切分为若干片段,使用本地向量模型编码
+    2. 对片段向量取平均并归一化,得到文档向量
+    3. 在相同上下文的已缓存文档中计算余弦相似度(内积)
+    4. 最高相似度超过阈值时复用该文档的关键词
+    
+    注意:
+        1. 向量模型在首次使用时才加载
+        2. 文档向量和关键词分别保存为semantic_cache.<模型标识>.npy和.json,
+           文件名包含向量模型名称的摘要,更换模型后不会与旧模型的向量比较
+        3. 使用全文片段的平均向量,避免长文档只按开头部分匹配
+        4. add()只更新内存,由flush()在批次结束(提取器关闭或进程退出)时
+           一次性写入磁盘,两个文件均先写临时文件再原子替换
+    """
+
+    CHUNK_SIZE = 256
+
+    def __init__(self, threshold: float, model_name: str, cache_dir: Path = CACHE_DIR):
+        self.threshold = threshold
+        self.model_name = model_name
+        # 不同模型的向量维度和空间都不同,按模型名称区分缓存文件
+        model_tag = hashlib.sha256(model_name.encode('utf-8')).hexdigest()[:12]
+        self.embeddings_path = cache_dir / f'semantic_cache.{model_tag}.npy'
+        self.entries_path = cache_dir / f'semantic_cache.{model_tag}.json'
+        self._model = None
+        self._dirty = False
+        self.embeddings, self.entries = self._load()
+
+    def _load(self):
+        """读取已保存的文档向量和关键词"""
+        try:
+            if self.embeddings_path.exists() and self.entries_path.exists():
+                embeddings = np.load(self.embeddings_path)
+                with open(self.entries_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+                if len(embeddings) == len(entries):
+                    return embeddings, entries
+                logger.warning("Semantic cache files are inconsistent, starting empty")
+        except Exception as e:
+            logger.warning(f"Failed to load semantic cache: {str(e)}")
+        return None, []
+
+    def flush(self) -> None:
+        """将新增的条目写入磁盘,没有新增时直接返回
+        
+        先写临时文件再原子替换,中断时不会留下截断的缓存文件;
+        向量文件先于条目文件替换,_load()会丢弃条数不一致的缓存
+        """
+        if not self._dirty:
+            return
+        pid = os.getpid()
+        embeddings_tmp = self.embeddings_path.with_name(f"{self.embeddings_path.name}.{pid}.tmp")
+        entries_tmp = self.entries_path.with_name(f"{self.entries_path.name}.{pid}.tmp")
+        try:
+            self.embeddings_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(embeddings_tmp, 'wb') as f:
+                np.save(f, self.embeddings)
+            with open(entries_tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(embeddings_tmp, self.embeddings_path)
+            os.replace(entries_tmp, self.entries_path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Failed to save semantic cache: {str(e)}")
+
+    def embed(self, text: str) -> np.ndarray:
+        """计算文档的归一化向量"""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+
+        chunks = [text[i:i + self.CHUNK_SIZE] for i in range(0, len(text), self.CHUNK_SIZE)] or ['']
+        vectors = self._model.encode(chunks, normalize_embeddings=True, convert_to_numpy=True)
+        embedding = vectors.mean(axis=0).astype(np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+
+    def lookup(self, embedding: np.ndarray, context: str) -> Optional[List[Dict[str, Any]]]:
+        """查找相同上下文中最相似的已缓存文档
+        
+        Returns:
+            Optional[List[Dict[str, Any]]]: 相似度超过阈值时返回其关键词,否则返回None
+        """
+        if self.embeddings is None:
+            return None
+
+        candidates = [i for i, entry in enumerate(self.entries) if entry['context'] == context]
+        if not candidates:
+            return None
+
+        scores = self.embeddings[candidates] @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] > self.threshold:
+            logger.info(f"Semantic cache hit, similarity: {scores[best]:.3f}")
+            # 返回副本,调用方会在关键词字典上补充来源文件等字段
+            return [dict(item) for item in self.entries[candidates[best]]['keywords']]
+        return None
+
+    def add(self, embedding: np.ndarray, context: str, keywords: List[Dict[str, Any]]) -> None:
+        """添加文档向量和关键词,由flush()统一写入磁盘"""
+        row = embedding[np.newaxis, :]
+        self.embeddings = row if self.embeddings is None else np.vstack([self.embeddings, row])
+        self.entries.append({'context': context, 'keywords': [dict(item) for item in keywords]})
+        self._dirty = True
+
+
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """获取语义缓存实例,未配置相似度阈值时返回None"""
+    global _semantic_cache
+    threshold = KEYWORDS_CONFIG.get('semantic_cache_threshold')
+    if threshold is None or not LLM_CACHE_CONFIG['enabled']:
+        return None
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(threshold, LLM_CACHE_CONFIG['semantic_model'])
+        # 未显式关闭提取器时,进程退出前同样保存新增条目
+        atexit.register(_semantic_cache.flush)
+    return _semantic_cache
+
+
+def flush_semantic_cache() -> None:
+    """保存语义缓存中新增的条目,语义缓存未创建时不做任何操作"""
+    if _semantic_cache is not None:
+        _semantic_cache.flush()
@@ -7,7 +7,7 @@ from wordcloud_generator import (
     LLMWordCloudGenerator,
     TfidfWordCloudGenerator
 )
-from utils import logger, load_exclude_keywords
+from utils import logger, configure_logging, load_exclude_keywords
 from config import DOCS_DIR
 
 def parse_args():
@@ -29,6 +29,7 @@ def parse_args():
 
 def main():
     """主函数入口"""
+    configure_logging()
     args = parse_args()
     
     # 解析需要屏蔽的关键词，优先级：命令行参数 > exclude_keywords.txt文件
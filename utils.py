@@ -8,27 +8,57 @@ import os
 import re
 import logging
 import fitz
-from docx import Document
+import zipfile
+import posixpath
+from lxml import etree
 from easyofd.ofd import OFD
 import base64
-from typing import Optional, Set
-import glob
-import json
+import functools
+import gzip
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 from pathlib import Path
 from config import LOG_CONFIG, DOC_CONFIG
 
-# 配置日志
-logging.basicConfig(
-    level=getattr(logging, LOG_CONFIG['level']),
-    format=LOG_CONFIG['format'],
-    handlers=[
-        logging.FileHandler(LOG_CONFIG['log_file']),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
+def configure_logging() -> None:
+    """配置根日志记录器,输出到日志文件和控制台
+    
+    由程序入口调用一次,导入本模块时不再打开日志文件,
+    避免进程池的每个工作进程重复创建文件句柄争用同一个日志文件。
+    根记录器已有处理器时直接返回,重复调用不会重复添加处理器。
+    
+    注意:
+        未调用本函数时(如工作进程中),WARNING及以上级别的日志
+        仍会由logging的默认处理器输出到stderr
+    """
+    if logging.getLogger().handlers:
+        return
+    logging.basicConfig(
+        level=getattr(logging, LOG_CONFIG['level']),
+        format=LOG_CONFIG['format'],
+        handlers=[
+            logging.FileHandler(LOG_CONFIG['log_file']),
+            logging.StreamHandler()
+        ]
+    )
+
+# 关闭MuPDF在解析异常PDF时向stderr输出的错误信息,问题文档会打印大量日志拖慢解析
+fitz.TOOLS.mupdf_display_errors(False)
+
+# PyMuPDF纯文本提取参数:保留空白,裁剪页面外文本,合并行尾连字符断词
+# 不保留连字(ligature),清洗后只保留中文,无需还原西文连字
+PDF_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_DEHYPHENATE
+
+# 匹配中文、数字和中文标点符号以外的连续字符
+# 保留范围内唯一的空白字符是全角空格\u3000,将其一并匹配后,
+# 替换结果中不会再出现连续空白,一次替换即可完成清洗
+NON_CJK_PATTERN = re.compile(r'[^\u4e00-\u9fa5\u3001-\u303f\uff00-\uffef0-9]+')
+
 def clean_text(text: str) -> str:
     """清洗文本,只保留中文、数字和中文标点符号
     
@@ -38,20 +68,41 @@ def clean_text(text: str) -> str:
     Returns:
         清洗后的文本
     """
-    # 匹配中文、数字和中文标点符号
-    pattern = re.compile(r'[^\u4e00-\u9fa5\u3000-\u303f\uff00-\uffef0-9]+')
-    # 将非中文、数字和标点替换为空格
-    cleaned = pattern.sub(' ', text)
-    # 合并多个空格
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    return cleaned.strip()
+    # 将非中文、数字和标点(含空白)替换为单个空格
+    return NON_CJK_PATTERN.sub(' ', text).strip()
+
+# 支持的文档扩展名,str.endswith可直接接受元组,在C层完成匹配
+SUPPORTED_FORMATS = tuple(DOC_CONFIG['supported_formats'])
+
+# 批量清洗多页文本时使用的分页标记,清洗时保留,清洗后再替换为换行
+PAGE_SEP = '\x00'
+NON_CJK_KEEP_SEP_PATTERN = re.compile(r'[^\u4e00-\u9fa5\u3001-\u303f\uff00-\uffef0-9\x00]+')
+# 分页标记连同两侧的空格和连续的空白页合并为一个换行
+PAGE_BREAK_PATTERN = re.compile(r' ?\x00[ \x00]*')
+
+def _clean_pages(pages: Iterable[str]) -> str:
+    """批量清洗多页文本,结果与逐页clean_text()后过滤空白页再用换行合并一致
+    
+    处理逻辑:
+    1. 用分页标记拼接所有页面的原始文本
+    2. 对整个文档执行一次正则清洗(分页标记被保留)
+    3. 将分页标记及其两侧空白、空白页替换为单个换行
+    
+    Args:
+        pages: Iterable[str], 各页面的原始文本
+        
+    Returns:
+        str: 清洗后的文本,页面之间使用换行符分隔
+    """
+    text = NON_CJK_KEEP_SEP_PATTERN.sub(' ', PAGE_SEP.join(pages))
+    return PAGE_BREAK_PATTERN.sub('\n', text).strip()
 
 def load_document(doc_path: str) -> str:
     """读取文档内容,支持Word、PDF和OFD格式
     
     处理逻辑:
     1. 根据文件扩展名判断文档类型
-    2. 针对Word文档:使用python-docx读取所有段落
+    2. 针对Word文档:流式解析document.xml读取所有段落
     3. 针对PDF:使用PyMuPDF逐页读取文本
     4. 针对OFD:先转换为PDF再提取文本
     5. 清洗文本,只保留中文、数字和标点符号
@@ -70,26 +121,186 @@ def load_document(doc_path: str) -> str:
         ValueError: 不支持的文件格式
         IOError: 文件读取失败
     """
-    if not any(doc_path.endswith(fmt) for fmt in DOC_CONFIG['supported_formats']):
+    if not doc_path.endswith(SUPPORTED_FORMATS):
         raise ValueError(f"Unsupported file format: {doc_path}")
         
     try:
-        if doc_path.endswith(('.doc', '.docx')):
-            return _load_word(doc_path)
-        elif doc_path.endswith('.pdf'):
-            return _load_pdf(doc_path)
-        elif doc_path.endswith('.ofd'):
-            return _load_ofd(doc_path)
+        return _extract_text(doc_path)
     except Exception as e:
         logger.error(f"Error reading {doc_path}: {str(e)}")
         return ""
 
+def _extract_text(doc_path: str) -> str:
+    """按扩展名选择加载函数提取文本,异常由调用方处理"""
+    if doc_path.endswith(('.doc', '.docx')):
+        return _load_word(doc_path)
+    elif doc_path.endswith('.pdf'):
+        return _load_pdf(doc_path)
+    elif doc_path.endswith('.ofd'):
+        return _load_ofd(doc_path)
+    raise ValueError(f"Unsupported file format: {doc_path}")
+
+def load_documents(doc_paths: List[str]) -> Iterator[Tuple[str, str]]:
+    """使用进程池并行读取多个文档
+    
+    处理逻辑:
+    1. 先查找文档文本缓存,命中的文档不再解析
+    2. 未命中的文档不超过1个时直接在当前进程读取
+    3. 否则将load_document()分发到进程池,各文档的解析互不依赖,
+       解析结果写入缓存
+    4. 按输入顺序逐个产出结果,调用方可在后续文档读取的同时
+       处理已读取的文档
+    
+    Args:
+        doc_paths: List[str], 文档文件路径列表
+        
+    Yields:
+        Tuple[str, str]: (文档路径, 文档文本),读取失败的文档文本为空字符串
+        
+    注意:
+        1. 进程数由DOC_CONFIG['max_workers']配置,默认为CPU核数
+        2. 缓存目录由DOC_CONFIG['cache_dir']配置,文件修改后缓存自动失效
+        3. Windows/macOS默认以spawn方式启动工作进程,会重新导入调用方的主模块,
+           调用脚本须将入口代码放在if __name__ == "__main__":之下;
+           进程池启动失败时自动回退为顺序读取
+    """
+    cached = {}
+    for doc_path in doc_paths:
+        text = _doc_cache_get(doc_path)
+        if text is not None:
+            cached[doc_path] = text
+    if cached:
+        logger.info(f"Loaded {len(cached)} documents from cache")
+
+    loaded = _load_uncached([doc_path for doc_path in doc_paths if doc_path not in cached])
+    for doc_path in doc_paths:
+        if doc_path in cached:
+            yield doc_path, cached[doc_path]
+        else:
+            text, error = next(loaded)
+            # 工作进程不配置日志处理器,读取错误统一在主进程中记录
+            if error is not None:
+                logger.error(f"Error reading {doc_path}: {error}")
+            yield doc_path, text
+
+def _load_uncached(doc_paths: List[str]) -> Iterator[Tuple[str, Optional[str]]]:
+    """按输入顺序产出未命中缓存的文档的(文本, 错误信息),多个文档时使用进程池
+    
+    进程池无法使用时(如spawn启动方式下调用方脚本缺少
+    if __name__ == "__main__"保护,工作进程启动失败),
+    剩余文档回退为在当前进程中逐个读取,不中断整个批次
+    """
+    done = 0
+    if len(doc_paths) > 1:
+        # 进程数不超过文档数,避免少量文档时启动大量空闲工作进程
+        max_workers = min(DOC_CONFIG['max_workers'] or os.cpu_count() or 1, len(doc_paths))
+        chunksize = max(1, len(doc_paths) // (max_workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for result in executor.map(_load_document_safe, doc_paths, chunksize=chunksize):
+                    yield result
+                    done += 1
+            return
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.warning(f"Process pool unavailable, reading remaining documents sequentially: {str(e)}")
+
+    for doc_path in doc_paths[done:]:
+        yield _load_document_safe(doc_path)
+
+def _load_document_safe(doc_path: str) -> Tuple[str, Optional[str]]:
+    """读取单个文档并写入缓存,可在工作进程中运行
+    
+    异常不在此处记录日志,而是将错误信息返回给主进程记录:
+    spawn方式启动的工作进程没有配置日志处理器,日志不会写入日志文件。
+    
+    Returns:
+        Tuple[str, Optional[str]]: (文档文本, 错误信息),
+            读取失败时文本为空字符串,成功时错误信息为None
+    """
+    try:
+        text = _extract_text(doc_path)
+    except Exception as e:
+        return "", str(e)
+    # 空文本可能来自临时的读取错误,不写入缓存
+    if text:
+        _doc_cache_put(doc_path, text)
+    return text, None
+
+# 文档文本缓存格式版本,修改文本提取或清洗逻辑时需要更新,使旧缓存失效
+DOC_CACHE_VERSION = 'v1'
+
+def _doc_cache_path(doc_path: str) -> Optional[Path]:
+    """根据文件路径、修改时间和大小计算缓存文件路径,未启用缓存或文件不可访问时返回None"""
+    if not DOC_CONFIG['cache_dir']:
+        return None
+    try:
+        stat = os.stat(doc_path)
+    except OSError:
+        return None
+    key = f"{os.path.abspath(doc_path)}:{stat.st_mtime_ns}:{stat.st_size}:{DOC_CACHE_VERSION}"
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=20).hexdigest()
+    return Path(DOC_CONFIG['cache_dir']) / f"{digest}.txt.gz"
+
+def _doc_cache_get(doc_path: str) -> Optional[str]:
+    """读取缓存的文档文本,未命中或读取失败时返回None"""
+    path = _doc_cache_path(doc_path)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to read document cache {path}: {str(e)}")
+        return None
+
+def _doc_cache_put(doc_path: str, text: str) -> None:
+    """写入文档文本缓存,先写临时文件再原子替换,避免留下不完整的缓存文件"""
+    path = _doc_cache_path(doc_path)
+    if path is None:
+        return
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(text.encode('utf-8')))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Failed to write document cache {path}: {str(e)}")
+
+# docx(OOXML)解析使用的命名空间和路径
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_P = f'{{{W_NS}}}p'
+W_T = f'{{{W_NS}}}t'
+W_BODY = f'{{{W_NS}}}body'
+OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+# 段落中直接的文本片段和换行/制表符,与python-docx的Paragraph.text取值范围一致
+# (不含文本框等嵌套内容)
+PARAGRAPH_RUN_ITEMS = etree.XPath('(w:r | w:hyperlink/w:r)/*', namespaces={'w': W_NS})
+RUN_BREAK_TAGS = frozenset(f'{{{W_NS}}}{tag}' for tag in ('tab', 'br', 'cr'))
+
+def _docx_main_part(zf: zipfile.ZipFile) -> str:
+    """从包关系文件中查找正文部件路径,通常为word/document.xml"""
+    rels = etree.fromstring(zf.read('_rels/.rels'))
+    for rel in rels:
+        if rel.get('Type') == OFFICE_DOCUMENT_REL:
+            return posixpath.normpath(rel.get('Target').lstrip('/'))
+    return 'word/document.xml'
+
+def _paragraph_text(para: etree._Element) -> str:
+    """拼接段落的文本内容,制表符和换行转为空格(清洗时同样会被替换为空格)"""
+    return ''.join(
+        item.text or '' if item.tag == W_T else ' ' if item.tag in RUN_BREAK_TAGS else ''
+        for item in PARAGRAPH_RUN_ITEMS(para)
+    )
+
 def _load_word(doc_path: str) -> str:
     """读取Word文档(.doc/.docx)的文本内容
     
     处理逻辑:
-    1. 使用python-docx打开Word文档
-    2. 提取所有段落的文本内容
+    1. 直接打开docx压缩包,使用lxml.etree.iterparse流式解析正文XML
+    2. 提取正文中所有段落的文本内容,处理完的节点立即清理
     3. 对每个段落进行文本清洗
     4. 过滤掉空白段落
     5. 合并剩余段落为完整文本
@@ -109,13 +320,23 @@ def _load_word(doc_path: str) -> str:
         3. 文本中保留段落格式(使用换行符)
         4. 支持.doc和.docx两种格式
         5. 出错时会返回空字符串
+        6. 只读取正文顶层段落(与python-docx的doc.paragraphs一致),
+           表格和文本框中的段落不参与合并
     """
-    doc = Document(doc_path)
     full_text = []
-    for para in doc.paragraphs:
-        text = clean_text(para.text)
-        if text.strip():
-            full_text.append(text.strip())
+    with zipfile.ZipFile(doc_path) as zf, zf.open(_docx_main_part(zf)) as f:
+        for _, para in etree.iterparse(f, events=('end',), tag=W_P):
+            parent = para.getparent()
+            if parent is None or parent.tag != W_BODY:
+                continue
+            text = clean_text(_paragraph_text(para))
+            if text:
+                full_text.append(text)
+
+            # 清理已处理的段落及之前的兄弟节点(含表格),释放内存
+            para.clear(keep_tail=True)
+            while para.getprevious() is not None:
+                del parent[0]
     return '\n'.join(full_text)
 
 def _load_pdf(doc_path: str) -> str:
@@ -123,10 +344,9 @@ def _load_pdf(doc_path: str) -> str:
     
     处理逻辑:
     1. 使用PyMuPDF(fitz)打开PDF文件
-    2. 按页面顺序提取文本内容
-    3. 对每页内容进行文本清洗
+    2. 按页面顺序提取文本内容,超长文档按页面范围拆分到多个进程并行提取
+    3. 合并所有页面后统一进行文本清洗
     4. 过滤空白页面
-    5. 合并所有页面内容
     
     Args:
         doc_path: str, PDF文档的完整路径
@@ -138,11 +358,14 @@ def _load_pdf(doc_path: str) -> str:
             - 已移除空白页面
             
     注意:
-        1. 使用clean_text()函数处理每页内容
+        1. 使用_clean_pages()对整个文档一次性清洗
         2. 自动处理PDF中的文本布局
         3. 空白页面会被过滤不参与合并
         4. 使用上下文管理器确保资源释放
         5. 出错时会返回空字符串
+        6. 页数达到DOC_CONFIG['pdf_parallel_min_pages']时并行提取;
+           已在load_documents()的工作进程中运行时不再嵌套创建进程池,
+           多文档场景已按文档并行
         
     额外说明:
         PyMuPDF提供了比较好的中文支持,可以正确处理:
@@ -150,13 +373,47 @@ def _load_pdf(doc_path: str) -> str:
         - 竖排文字
         - 非标准PDF格式
     """
-    full_text = []
     with fitz.open(doc_path) as doc:
-        for page in doc:
-            text = clean_text(page.get_text())
-            if text.strip():
-                full_text.append(text.strip())
-    return '\n'.join(full_text)
+        page_count = doc.page_count
+        if page_count < DOC_CONFIG['pdf_parallel_min_pages'] or multiprocessing.parent_process() is not None:
+            return _clean_pages(page.get_text("text", sort=False, flags=PDF_TEXT_FLAGS) for page in doc)
+    return _load_pdf_parallel(doc_path, page_count)
+
+def _load_pdf_parallel(doc_path: str, page_count: int) -> str:
+    """将PDF按连续的页面范围拆分到进程池中并行提取文本
+    
+    PyMuPDF不支持多线程,因此使用多进程,每个进程独立打开文件,
+    只提取并清洗自己负责的页面范围,结果按页面顺序合并。
+    各范围分别清洗后用换行合并,与整体清洗的结果一致。
+    
+    Args:
+        doc_path: str, PDF文档的完整路径
+        page_count: int, 文档总页数
+        
+    Returns:
+        str: 提取的文本内容,格式与_load_pdf()一致
+        
+    注意:
+        进程池无法使用时(如spawn启动方式下调用方缺少__main__保护),
+        回退为在当前进程中顺序提取
+    """
+    max_workers = min(DOC_CONFIG['max_workers'] or os.cpu_count() or 1, page_count)
+    step = -(-page_count // max_workers)
+    starts = range(0, page_count, step)
+    stops = [min(start + step, page_count) for start in starts]
+    try:
+        with ProcessPoolExecutor(max_workers=len(starts)) as executor:
+            parts = executor.map(_load_pdf_pages, [doc_path] * len(starts), starts, stops)
+            return '\n'.join(part for part in parts if part)
+    except (BrokenProcessPool, RuntimeError) as e:
+        logger.warning(f"Process pool unavailable, extracting {doc_path} sequentially: {str(e)}")
+        return _load_pdf_pages(doc_path, 0, page_count)
+
+def _load_pdf_pages(doc_path: str, start: int, stop: int) -> str:
+    """提取PDF中[start, stop)范围内页面的文本并清洗"""
+    with fitz.open(doc_path) as doc:
+        return _clean_pages(doc[i].get_text("text", sort=False, flags=PDF_TEXT_FLAGS)
+                            for i in range(start, stop))
 
 def _load_ofd(doc_path: str) -> str:
     """读取OFD(开放版式文档)的文本内容
@@ -184,7 +441,7 @@ def _load_ofd(doc_path: str) -> str:
         4. PDF字节流 -> 文本内容
         
     注意:
-        1. 使用clean_text()函数处理每页内容
+        1. 使用_clean_pages()对整个文档一次性清洗
         2. 中间过程使用内存处理,不生成临时文件
         3. 最后会自动清理OFD相关资源
         4. 特别关注内存使用和资源释放
@@ -195,32 +452,30 @@ def _load_ofd(doc_path: str) -> str:
         PDF的方式实现内容提取,以获得更好的兼容性。
     """
     # 读取OFD文件并转base64
+    # easyofd内部只接受base64输入,直接传入bytes,省去解码为str的一次复制
     with open(doc_path, "rb") as f:
-        ofdb64 = str(base64.b64encode(f.read()), "utf-8")
+        ofdb64 = base64.b64encode(f.read())
     
     # 初始化OFD工具类并读取内容
     ofd = OFD()
-    ofd.read(ofdb64, save_xml=False)
-    
-    # 获取PDF字节内容并读取
-    pdf_bytes = ofd.to_pdf()
-    full_text = []
-    
-    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        for page in doc:
-            text = clean_text(page.get_text())
-            if text.strip():
-                full_text.append(text.strip())
-    
-    # 清理资源        
-    ofd.del_data()
-    return '\n'.join(full_text)
+    try:
+        ofd.read(ofdb64, fmt="b64", save_xml=False)
+        del ofdb64
+        
+        # 获取PDF字节内容并读取
+        pdf_bytes = ofd.to_pdf()
+        
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            return _clean_pages(page.get_text("text", sort=False, flags=PDF_TEXT_FLAGS) for page in doc)
+    finally:
+        # 清理资源,解析失败时同样释放
+        ofd.del_data()
 
 def get_doc_files(folder_path: str) -> list:
     """递归获取文件夹下所有支持的文档文件路径
     
     处理逻辑:
-    1. 使用os.walk递归遍历目录结构
+    1. 使用os.scandir按深度优先顺序遍历目录结构(与os.walk顺序一致)
     2. 检查每个文件的扩展名是否在支持列表中
     3. 返回所有匹配文件的完整路径
     
@@ -234,16 +489,46 @@ def get_doc_files(folder_path: str) -> list:
             - OFD文档(.ofd)
         
     注意:
-        文件格式支持列表在DOC_CONFIG['supported_formats']中定义
+        1. 文件格式支持列表在DOC_CONFIG['supported_formats']中定义
+        2. DirEntry的类型判断使用目录项中缓存的信息,多数文件系统上无需额外stat
+        3. 与os.walk相同,不进入指向目录的符号链接,无法访问的目录直接跳过
     """
     doc_files = []
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            if any(file.endswith(fmt) for fmt in DOC_CONFIG['supported_formats']):
-                doc_files.append(os.path.join(root, file))
+    pending = [folder_path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        sub_dirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not entry.is_symlink():
+                    sub_dirs.append(entry.path)
+            elif entry.name.endswith(SUPPORTED_FORMATS):
+                doc_files.append(entry.path)
+        # 逆序入栈,保证子目录按列出顺序依次处理
+        pending.extend(reversed(sub_dirs))
     return doc_files
 
-def load_stopwords(file_path: str = 'stopwords.txt') -> Set[str]:
+def _read_word_set(file_path: str) -> Set[str]:
+    """一次性读取UTF-8词表文件,返回去除空行和#注释行后的词集合
+    
+    整个文件以二进制方式一次读入后整体解码和分行,
+    避免文本模式逐行迭代时每行一次的解码和对象开销
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read().decode('utf-8')
+    return {line.strip() for line in data.splitlines() if line.strip() and not line.startswith('#')}
+
+@functools.lru_cache(maxsize=8)
+def load_stopwords(file_path: str = 'stopwords.txt') -> FrozenSet[str]:
     """从指定文件加载中文停用词表
     
     处理逻辑:
@@ -259,7 +544,7 @@ def load_stopwords(file_path: str = 'stopwords.txt') -> Set[str]:
         file_path: str, 停用词文件的路径,默认为'stopwords.txt'
         
     Returns:
-        Set[str]: 停用词集合
+        FrozenSet[str]: 停用词集合
             - 每个词为一个独立元素
             - 自动去除重复词
             - 不包含空字符串
@@ -272,6 +557,10 @@ def load_stopwords(file_path: str = 'stopwords.txt') -> Set[str]:
         1. 记录警告日志
         2. 返回空集合
         
+    缓存:
+        结果按文件路径缓存,同一进程内重复调用不再读取文件;
+        返回不可变集合,避免调用方修改缓存内容
+        
     文件格式要求:
         1. UTF-8编码的文本文件
         2. 每行一个停用词
@@ -290,47 +579,44 @@ def load_stopwords(file_path: str = 'stopwords.txt') -> Set[str]:
         3. 注意停用词的规范性和完整性
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return {line.strip() for line in f if line.strip() and not line.startswith('#')}
+        return frozenset(_read_word_set(file_path))
     except Exception as e:
         logger.warning(f"Failed to load stopwords from {file_path}: {str(e)}")
-        return set()
+        return frozenset()
 
-def load_github_stopwords(github_stopwords_dir: str = "github_stop_words") -> Set[str]:
+@functools.lru_cache(maxsize=8)
+def load_github_stopwords(github_stopwords_dir: str = "github_stop_words") -> FrozenSet[str]:
     """加载github_stop_words目录下的停用词
     
     Args:
         github_stopwords_dir: github停用词目录
         
     Returns:
-        停用词集合
+        停用词集合(不可变,结果按目录路径缓存)
     """
     github_stopwords = set()
     try:
-        txt_files = glob.glob(os.path.join(github_stopwords_dir, "*.txt"))
+        txt_files = list(Path(github_stopwords_dir).glob("*.txt"))
         
         if not txt_files:
             logger.warning(f"No txt files found in {github_stopwords_dir}")
-            return set()
+            return frozenset()
             
         for txt_file in txt_files:
             try:
-                with open(txt_file, 'r', encoding='utf-8') as f:
-                    github_stopwords.update(
-                        line.strip() for line in f 
-                        if line.strip() and not line.startswith('#')
-                    )
+                github_stopwords.update(_read_word_set(txt_file))
             except Exception as e:
                 logger.error(f"Error processing {txt_file}: {e}")
                 
         logger.info(f"Loaded {len(github_stopwords)} github stopwords from {len(txt_files)} files")
-        return github_stopwords
+        return frozenset(github_stopwords)
         
     except Exception as e:
         logger.error(f"Error loading github stopwords: {e}")
-        return set()
+        return frozenset()
 
-def load_exclude_keywords(exclude_keywords_file: str = 'exclude_keywords.txt') -> Set[str]:
+@functools.lru_cache(maxsize=8)
+def load_exclude_keywords(exclude_keywords_file: str = 'exclude_keywords.txt') -> FrozenSet[str]:
     """从指定文件加载需要排除的关键词
     
     处理逻辑:
@@ -346,7 +632,7 @@ def load_exclude_keywords(exclude_keywords_file: str = 'exclude_keywords.txt') -
         exclude_keywords_file: str, 排除关键词文件的路径,默认为'exclude_keywords.txt'
         
     Returns:
-        Set[str]: 排除关键词集合
+        FrozenSet[str]: 排除关键词集合
             - 每个词为一个独立元素
             - 自动去除重复词
             - 不包含空字符串
@@ -359,6 +645,10 @@ def load_exclude_keywords(exclude_keywords_file: str = 'exclude_keywords.txt') -
         1. 记录警告日志
         2. 返回空集合
         
+    缓存:
+        结果按文件路径缓存,同一进程内重复调用不再读取文件;
+        返回不可变集合,避免调用方修改缓存内容
+        
     文件格式要求:
         1. UTF-8编码的文本文件
         2. 每行一个排除关键词
@@ -377,8 +667,7 @@ def load_exclude_keywords(exclude_keywords_file: str = 'exclude_keywords.txt') -
         3. 注意排除词的规范性和完整性
     """
     try:
-        with open(exclude_keywords_file, 'r', encoding='utf-8') as f:
-            return {line.strip() for line in f if line.strip() and not line.startswith('#')}
+        return frozenset(_read_word_set(exclude_keywords_file))
     except Exception as e:
         logger.warning(f"Failed to load exclude keywords from {exclude_keywords_file}: {str(e)}")
-        return set()
\ No newline at end of file
+        return frozenset()
\ No newline at end of file
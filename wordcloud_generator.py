@@ -12,27 +12,34 @@
 - 基于TF-IDF的关键词提取和词云生成
 
 依赖项:
-- python-docx: 处理Word文档 
+- lxml: 解析Word文档(docx)
 - PyMuPDF: 处理PDF文档
 - scikit-learn: TF-IDF实现
+- jieba: 中文分词
 - wordcloud: 词云生成
 - requests: LLM API调用
 """
 
+import heapq
+import logging
 import os
+from operator import itemgetter
 from typing import Dict, List, Optional, Set, Any
 from pathlib import Path
+import jieba
 import numpy as np
 import pandas as pd
-from collections import defaultdict
 from PIL import Image
 from wordcloud import WordCloud
 from sklearn.feature_extraction.text import TfidfVectorizer
 
 from config import WORDCLOUD_CONFIG
-from utils import load_document, get_doc_files, load_stopwords, logger
+from utils import load_documents, get_doc_files, load_stopwords, logger
 from llm_extractor import DeepseekExtractor, OllamaExtractor
 
+# jieba默认以DEBUG级别输出词典加载信息,避免写入项目日志
+jieba.setLogLevel(logging.INFO)
+
 
 class BaseWordCloudGenerator:
     """词云生成器基类"""
@@ -61,7 +68,7 @@ class BaseWordCloudGenerator:
         
         处理流程:
         1. 验证词频字典是否为空
-        2. 使用WordCloud生成词云图
+        2. 选出权重最高的max_words个词,使用WordCloud生成词云图
         3. 确保输出目录存在
         4. 保存词云图到指定路径
         
@@ -86,7 +93,10 @@ class BaseWordCloudGenerator:
                 logger.error("Empty word frequency dictionary")
                 return False
                 
-            self.wordcloud.generate_from_frequencies(word_freq)
+            # 词云最多只绘制max_words个词,先用堆选出权重最高的部分,
+            # WordCloud内部只需对这些词排序(结果与对全部词排序后截断一致)
+            top_words = heapq.nlargest(self.wordcloud.max_words, word_freq.items(), key=itemgetter(1))
+            self.wordcloud.generate_from_frequencies(dict(top_words))
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             self.wordcloud.to_file(str(output_path))
@@ -97,29 +107,42 @@ class BaseWordCloudGenerator:
             logger.error(f"Failed to generate word cloud: {str(e)}")
             return False
             
-    def save_keywords_excel(self, keywords: List[Dict], output_path: str):
-        """保存关键词统计结果到Excel
+    @staticmethod
+    def _build_df(keywords: List[Dict]) -> pd.DataFrame:
+        """将关键词列表转换为DataFrame
         
-        处理逻辑:
-        1. 将关键词列表转换为DataFrame
-        2. 按文件名和权重值排序
-        3. 导出为Excel文件
+        只构建一次,供save_keywords_excel()和_combine_keywords()共用;
+        保持关键词的原始出现顺序,合并时同权重关键词按首次出现的先后排列
         
         Args:
             keywords: List[Dict], 关键词列表,每项包含:
                 - file_name: str, 文件名
                 - keyword: str, 关键词
                 - weight: float, 权重值
+                
+        Returns:
+            pd.DataFrame: 按原始顺序排列的关键词表
+        """
+        return pd.DataFrame(keywords)
+        
+    def save_keywords_excel(self, df: pd.DataFrame, output_path: str):
+        """保存关键词统计结果到Excel
+        
+        处理逻辑:
+        1. 接收_build_df()构建的关键词表
+        2. 按文件名升序、权重降序排列后导出为Excel文件
+        
+        Args:
+            df: pd.DataFrame, _build_df()返回的关键词表
             output_path: str, 输出Excel文件路径
             
         注意:
             如果output_path所在目录不存在会自动创建
         """
         try:
-            df = pd.DataFrame(keywords)
-            df = df.sort_values(['file_name', 'weight'], ascending=[True, False])
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
+            df = df.sort_values(['file_name', 'weight'], ascending=[True, False])
             df.to_excel(output_path, index=False)
             logger.info(f"Saved keywords to Excel: {output_path}")
         except Exception as e:
@@ -195,8 +218,9 @@ class LLMWordCloudGenerator(BaseWordCloudGenerator):
             2. document_keywords_llm.xlsx: 关键词统计
             
         注意:
-            即使部分文档处理失败,只要有成功处理的内容,
-            仍会继续生成最终的词云和Excel文件
+            1. 即使部分文档处理失败,只要有成功处理的内容,
+               仍会继续生成最终的词云和Excel文件
+            2. 关键词提取完成(或出错)后关闭LLM提取器的HTTP会话
         """
         docs_dir = Path(docs_dir)
         if not docs_dir.exists():
@@ -209,32 +233,39 @@ class LLMWordCloudGenerator(BaseWordCloudGenerator):
             logger.error("No documents found in directory")
             return False
             
-        # 处理每个文档
+        # 多进程并行读取文档,按顺序逐个提取关键词
+        # 提取结束后关闭提取器的HTTP连接池(之后再次调用时会按需重建连接)
         all_keywords = []
-        for doc_path in doc_files:
-            keywords = self._process_single_document(doc_path)
-            if keywords:
-                all_keywords.extend(keywords)
+        try:
+            for doc_path, text in load_documents(doc_files):
+                keywords = self._process_single_document(doc_path, text)
+                if keywords:
+                    all_keywords.extend(keywords)
+        finally:
+            self.extractor.close()
                 
         if not all_keywords:
             logger.error("No keywords extracted from documents")
             return False
             
+        # 关键词表只构建一次,供Excel导出和权重合并共用
+        df = self._build_df(all_keywords)
+        
         # 保存关键词Excel
         excel_path = self.output_dir / "document_keywords_llm.xlsx"
-        self.save_keywords_excel(all_keywords, excel_path)
+        self.save_keywords_excel(df, excel_path)
         
         # 生成词云
-        word_freq = self._combine_keywords(all_keywords)
+        word_freq = self._combine_keywords(df)
         wordcloud_path = self.output_dir / "wordcloud_llm.png" 
         return self.generate(word_freq, wordcloud_path)
         
-    def _process_single_document(self, doc_path: str) -> List[Dict[str, Any]]:
+    def _process_single_document(self, doc_path: str, text: str) -> List[Dict[str, Any]]:
         """处理单个文档文件并提取关键词
         
         处理步骤:
-        1. 文档读取:
-           - 使用load_document()函数读取文件
+        1. 文档检查:
+           - 文本由load_documents()在进程池中预先读取
            - 支持Word、PDF、OFD等格式
            - 确保文本内容非空
            
@@ -250,6 +281,7 @@ class LLMWordCloudGenerator(BaseWordCloudGenerator):
            
         Args:
             doc_path: str, 文档的完整路径
+            text: str, 文档的文本内容
             
         Returns:
             List[Dict[str, Any]]: 标准格式的关键词列表:
@@ -276,7 +308,6 @@ class LLMWordCloudGenerator(BaseWordCloudGenerator):
             - 包含来源文件信息
         """
         try:
-            text = load_document(doc_path)
             if not text:
                 return []
                 
@@ -293,17 +324,17 @@ class LLMWordCloudGenerator(BaseWordCloudGenerator):
             
         return []
         
-    def _combine_keywords(self, keywords: List[Dict]) -> Dict[str, float]:
+    def _combine_keywords(self, df: pd.DataFrame) -> Dict[str, float]:
         """合并多篇文档的关键词权重
         
         处理逻辑:
-        1. 使用defaultdict累加相同关键词的权重
+        1. 使用pandas groupby累加相同关键词的权重
         2. 对累加后的权重进行标准化(除以最大值)
            使所有权重缩放到0-1区间
         3. 过滤掉需要屏蔽的关键词
         
         Args:
-            keywords: List[Dict], 关键词列表,每项包含:
+            df: pd.DataFrame, _build_df()返回的关键词表,包含列:
                 - keyword: str, 关键词
                 - weight: float, 原始权重值
                 - file_name: str, 来源文件
@@ -314,28 +345,27 @@ class LLMWordCloudGenerator(BaseWordCloudGenerator):
                 - value: float, 标准化后的权重(0-1)
                 
         注意:
-            1. 如果keywords为空,返回空字典
+            1. 如果关键词表为空,返回空字典
             2. 如果所有权重都为0,返回空字典
             3. 权重标准化可以让词云显示效果更均衡
             4. 屏蔽的关键词会被过滤掉
         """
-        if not keywords:
+        if df.empty:
             return {}
             
-        combined = defaultdict(float)
-        for item in keywords:
-            keyword = item['keyword']
-            # 过滤掉需要屏蔽的关键词
-            if keyword not in self.exclude_keywords:
-                combined[keyword] += item['weight']
+        # 过滤掉需要屏蔽的关键词
+        if self.exclude_keywords:
+            df = df[~df['keyword'].isin(self.exclude_keywords)]
+        # 按关键词分组求和,sort=False保持关键词首次出现的顺序
+        combined = df.groupby('keyword', sort=False)['weight'].sum()
             
-        if not combined:
+        if combined.empty:
             return {}
             
         # 标准化权重
-        max_weight = max(combined.values())
+        max_weight = combined.max()
         if max_weight > 0:
-            return {k: v/max_weight for k, v in combined.items()}
+            return (combined / max_weight).to_dict()
         return {}
 
 class TfidfWordCloudGenerator(BaseWordCloudGenerator):
@@ -363,11 +393,16 @@ class TfidfWordCloudGenerator(BaseWordCloudGenerator):
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.exclude_keywords = exclude_keywords or set()
         
+        # 文档在读取时已用jieba分词并过滤停用词,analyzer直接返回分词结果,
+        # 跳过sklearn内部的正则分词
+        # 使用float32存储TF-IDF矩阵,内存占用减半,精度对关键词排序足够
         self.vectorizer = TfidfVectorizer(
-            token_pattern=r"(?u)\b\w+\b",
+            analyzer=lambda tokens: tokens,
+            lowercase=False,
             max_features=1000,
             min_df=min_df,
-            max_df=max_df
+            max_df=max_df,
+            dtype=np.float32
         )
         self.top_n = top_n
         
@@ -394,21 +429,24 @@ class TfidfWordCloudGenerator(BaseWordCloudGenerator):
                 logger.error("No documents found in directory")
                 return False
                 
-            doc_data = self._read_documents(doc_files)
+            doc_data = self._read_documents(doc_files, stopwords)
             if not doc_data:
                 return False
                 
             # 提取关键词
-            all_keywords = self._extract_keywords(doc_data, stopwords)
+            all_keywords = self._extract_keywords(doc_data)
             if not all_keywords:
                 return False
                 
+            # 关键词表只构建一次,供Excel导出和权重合并共用
+            df = self._build_df(all_keywords)
+            
             # 保存Excel
             excel_path = self.output_dir / "document_keywords_tfidf.xlsx"
-            self.save_keywords_excel(all_keywords, excel_path)
+            self.save_keywords_excel(df, excel_path)
             
             # 生成词云
-            word_freq = self._combine_keywords(all_keywords)
+            word_freq = self._combine_keywords(df)
             wordcloud_path = self.output_dir / "wordcloud_tfidf.png"
             return self.generate(word_freq, wordcloud_path)
             
@@ -416,59 +454,71 @@ class TfidfWordCloudGenerator(BaseWordCloudGenerator):
             logger.error(f"Error processing documents: {str(e)}")
             return False
             
-    def _read_documents(self, doc_files: List[str]) -> List[Dict[str, str]]:
-        """读取文档内容
+    def _read_documents(self, doc_files: List[str], stopwords: Set[str]) -> List[Dict[str, Any]]:
+        """读取文档内容并分词
         
         Args:
             doc_files: 文档路径列表
+            stopwords: 停用词集合,分词时过滤
             
         Returns:
-            List[Dict]: 包含文件名和内容的字典列表
+            List[Dict]: 包含文件名、内容和分词结果(tokens)的字典列表
         """
         doc_data = []
-        for doc_path in doc_files:
-            try:
-                text = load_document(doc_path)
-                if text:
-                    doc_data.append({
-                        'file_name': Path(doc_path).stem,
-                        'content': text
-                    })
-                    logger.info(f"Read document: {doc_path}")
-            except Exception as e:
-                logger.error(f"Error reading {doc_path}: {str(e)}")
+        for doc_path, text in load_documents(doc_files):
+            if text:
+                doc_data.append({
+                    'file_name': Path(doc_path).stem,
+                    'content': text,
+                    'tokens': self._tokenize(text, stopwords)
+                })
+                logger.info(f"Read document: {doc_path}")
         return doc_data
         
-    def _extract_keywords(self, 
-                         doc_data: List[Dict[str, str]], 
-                         stopwords: Set[str]) -> List[Dict]:
-        """提取关键词
+    @staticmethod
+    def _tokenize(text: str, stopwords: Set[str]) -> List[str]:
+        """使用jieba精确模式对中文文本分词
+        
+        只保留由文字或数字组成的词(去掉标点和空白),并过滤停用词。
+        不使用cut_for_search:搜索引擎模式会把长词再切出重叠的短词,
+        同一段文字被重复计数,会扭曲TF-IDF权重。
         
         Args:
-            doc_data: 文档数据列表
+            text: 清洗后的文档文本
             stopwords: 停用词集合
             
+        Returns:
+            List[str]: 分词结果
+        """
+        return [word for word in jieba.lcut(text) if word.isalnum() and word not in stopwords]
+        
+    def _extract_keywords(self, doc_data: List[Dict[str, Any]]) -> List[Dict]:
+        """提取关键词
+        
+        Args:
+            doc_data: 文档数据列表,tokens为已过滤停用词的分词结果
+            
         Returns:
             List[Dict]: 关键词列表
         """
         try:
-            # 更新停用词
-            self.vectorizer.stop_words = stopwords
-            
-            # 获取文档内容
-            texts = [doc['content'] for doc in doc_data]
-            if not texts:
+            # 获取文档分词结果
+            tokens = [doc['tokens'] for doc in doc_data]
+            if not tokens:
                 return []
                 
             # 计算TF-IDF
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
+            tfidf_matrix = self.vectorizer.fit_transform(tokens)
             feature_names = self.vectorizer.get_feature_names_out()
             
-            # 提取关键词
+            # 提取关键词,直接读取CSR矩阵每行的非零元素(切片为视图,不复制数据)
             all_keywords = []
+            indptr = tfidf_matrix.indptr
             for i, doc in enumerate(doc_data):
+                start, end = indptr[i], indptr[i + 1]
                 keywords = self._extract_doc_keywords(
-                    tfidf_matrix[i],
+                    tfidf_matrix.data[start:end],
+                    tfidf_matrix.indices[start:end],
                     feature_names,
                     doc['file_name']
                 )
@@ -481,19 +531,21 @@ class TfidfWordCloudGenerator(BaseWordCloudGenerator):
             return []
             
     def _extract_doc_keywords(self,
-                           tfidf_vector: np.ndarray,
+                           tfidf_scores: np.ndarray,
+                           term_indices: np.ndarray,
                            feature_names: np.ndarray,  
                            file_name: str) -> List[Dict]:
         """从TF-IDF向量中提取单个文档的关键词
         
         处理逻辑:
-        1. 将稀疏向量转换为稠密数组
-        2. 获取TF-IDF分数最高的top_n个词
+        1. 只在稀疏向量的非零元素上操作,不转换为稠密数组
+        2. 使用argpartition获取TF-IDF分数最高的top_n个词
         3. 过滤掉TF-IDF分数为0的词
         4. 构造标准格式的关键词字典列表
         
         Args:
-            tfidf_vector: np.ndarray, 文档的TF-IDF向量(稀疏矩阵)
+            tfidf_scores: np.ndarray, 文档TF-IDF向量中非零元素的分数(CSR行的data)
+            term_indices: np.ndarray, 非零元素对应的词汇表下标(CSR行的indices)
             feature_names: np.ndarray, 词汇表中的特征名称
             file_name: str, 文档文件名
             
@@ -508,30 +560,42 @@ class TfidfWordCloudGenerator(BaseWordCloudGenerator):
             2. TF-IDF分数为0的词会被过滤掉
             3. 不会对TF-IDF分数进行标准化
         """
-        tfidf_scores = tfidf_vector.toarray()[0]
-        top_indices = tfidf_scores.argsort()[::-1][:self.top_n]
+        top_positions = self._top_k_indices(tfidf_scores, self.top_n)
         
         keywords = []
-        for idx in top_indices:
-            if tfidf_scores[idx] > 0:
+        for pos in top_positions:
+            if tfidf_scores[pos] > 0:
                 keywords.append({
                     'file_name': file_name,
-                    'keyword': feature_names[idx],
-                    'weight': float(tfidf_scores[idx])
+                    'keyword': feature_names[term_indices[pos]],
+                    'weight': float(tfidf_scores[pos])
                 })
         return keywords
         
-    def _combine_keywords(self, keywords: List[Dict]) -> Dict[str, float]:
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """返回分数最高的k个元素的下标,按分数降序排列
+        
+        先用np.argpartition在O(V)时间内选出前k个,再只对这k个排序,
+        避免对整个向量做O(V log V)的全排序
+        """
+        if 0 < k < scores.size:
+            indices = np.argpartition(scores, -k)[-k:]
+        else:
+            indices = np.arange(scores.size)[:max(k, 0)]
+        return indices[np.argsort(scores[indices])[::-1]]
+        
+    def _combine_keywords(self, df: pd.DataFrame) -> Dict[str, float]:
         """合并多个文档的关键词权重
         
         处理流程:
         1. 数据验证:
-           - 检查输入列表是否为空
+           - 检查关键词表是否为空
            - 验证关键词和权重格式
            - 过滤掉需要屏蔽的关键词
            
         2. 权重合并:
-           - 使用defaultdict累加相同关键词的权重
+           - 使用pandas groupby累加相同关键词的权重
            - 对所有文档的权重求和
            
         3. 权重标准化:
@@ -540,15 +604,10 @@ class TfidfWordCloudGenerator(BaseWordCloudGenerator):
            - 处理边界情况(全0权重)
            
         Args:
-            keywords: List[Dict], 包含多个文档的关键词列表:
-                [
-                    {
-                        'file_name': str, 文档名,
-                        'keyword': str, 关键词,
-                        'weight': float, 原始权重
-                    },
-                    ...
-                ]
+            df: pd.DataFrame, _build_df()返回的多个文档的关键词表,包含列:
+                - file_name: str, 文档名
+                - keyword: str, 关键词
+                - weight: float, 原始权重
                 
         Returns:
             Dict[str, float]: 合并后的词频字典:
@@ -559,7 +618,7 @@ class TfidfWordCloudGenerator(BaseWordCloudGenerator):
                 }
                 
         特殊情况:
-            1. 输入为空列表: 返回空字典{}
+            1. 输入为空表: 返回空字典{}
             2. 所有权重为0: 返回空字典{}
             3. 单个关键词: 权重设为1.0
             4. 所有关键词都被屏蔽: 返回空字典{}
@@ -569,21 +628,20 @@ class TfidfWordCloudGenerator(BaseWordCloudGenerator):
             2. 权重总和可能不为1(非概率分布)
             3. 屏蔽的关键词会被过滤掉
         """
-        if not keywords:
+        if df.empty:
             return {}
             
-        combined = defaultdict(float)
-        for item in keywords:
-            keyword = item['keyword']
-            # 过滤掉需要屏蔽的关键词
-            if keyword not in self.exclude_keywords:
-                combined[keyword] += item['weight']
+        # 过滤掉需要屏蔽的关键词
+        if self.exclude_keywords:
+            df = df[~df['keyword'].isin(self.exclude_keywords)]
+        # 按关键词分组求和,sort=False保持关键词首次出现的顺序
+        combined = df.groupby('keyword', sort=False)['weight'].sum()
             
-        if not combined:
+        if combined.empty:
             return {}
             
         # 标准化权重
-        max_weight = max(combined.values())
+        max_weight = combined.max()
         if max_weight > 0:
-            return {k: v/max_weight for k, v in combined.items()}
+            return (combined / max_weight).to_dict()
         return {}